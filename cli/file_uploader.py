@@ -23,19 +23,22 @@ import json
 import time
 import hashlib
 import argparse
+import atexit
 import threading
+from collections import Counter
 import mimetypes
 import configparser
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any, Callable
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple, Any, Callable, Iterable, Iterator, Union
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
 import urllib.parse
 import urllib.request
 import urllib.error
 import http.client
 import ssl
-import gzip
+import socket
+import select
 import zlib
 import base64
 import secrets
@@ -43,14 +46,64 @@ import tempfile
 import shutil
 import fnmatch
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from queue import Queue, Empty
+import functools
+import contextlib
+import itertools
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+import multiprocessing
+from queue import Queue, LifoQueue, Empty, Full
 import signal
+import asyncio
+from stat import S_ISREG, S_ISDIR
+
+# Optional: enables the asyncio upload backend
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Optional: enables AES-GCM encryption
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+except ImportError:
+    Cipher = None
 
 # Version information
 VERSION = "2.0.0"
 APP_NAME = "Advanced File Uploader"
 
+# I/O buffer sizes
+READ_BUFFER_SIZE = 1 << 20  # 1 MiB
+MIN_CHUNK_SIZE = 64 * 1024  # 64 KiB
+
+# AES-GCM output layout: salt | nonce | ciphertext | tag
+AES_SALT_SIZE = 16
+AES_NONCE_SIZE = 12
+AES_TAG_SIZE = 16
+ENCRYPTION_METHODS = ('xor', 'aes-gcm')
+
+# Files below this size are transformed in memory instead of on a worker process
+SPOOL_MAX_SIZE = 4 << 20  # 4 MiB
+
+# Resume state is saved at most this often during a chunked upload
+RESUME_SAVE_INTERVAL = 2.0  # seconds
+RESUME_SAVE_BYTES = 16 << 20  # or after this many bytes (16 MiB)
+
+# __slots__ for the per-file/per-run dataclasses where supported (Python 3.10+)
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Already-compressed formats, never worth gzipping again
+COMPRESSED_EXTENSIONS = frozenset({
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.7z', '.rar',
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic',
+    '.mp3', '.m4a', '.aac', '.ogg', '.flac', '.opus',
+    '.mp4', '.m4v', '.mkv', '.mov', '.avi', '.webm',
+    '.pdf', '.docx', '.xlsx', '.pptx', '.odt', '.ods', '.odp', '.epub', '.jar', '.apk',
+})
+
+# Compressed output must be at most this fraction of the input to be kept
+MAX_COMPRESSION_RATIO = 0.97
+
 # ANSI color codes for terminal output
 class Colors:
     RED = '\033[0;31m'
@@ -70,7 +123,7 @@ DEFAULT_CONFIG = {
     'key': '',
     'max_file_size': 104857600,  # 100MB
     'max_concurrent': 4,
-    'chunk_size': 8192,
+    'chunk_size': 262144,  # 256KB
     'timeout': 30,
     'retry_attempts': 3,
     'retry_delay': 1,
@@ -90,12 +143,93 @@ DEFAULT_CONFIG = {
     'include_patterns': '',
     'preserve_structure': True,
     'create_checksums': True,
+    'hash_algo': 'sha256',  # any fixed-length hashlib algorithm, e.g. blake2b
     'resume_enabled': True,
     'encryption_key': '',
-    'compression_level': 6
+    'encryption_method': 'xor',
+    'compression_level': 4  # fast lazy-matching level; 6+ costs more CPU for little gain
 }
 
-@dataclass
+# Interactive menu text, formatted once and printed with a single call
+MAIN_MENU = (
+    f"{Colors.CYAN}Commands:{Colors.END}\n"
+    "  [1] Browse files and directories\n"
+    "  [2] Select files for upload\n"
+    "  [3] Upload queue management\n"
+    "  [4] Configuration settings\n"
+    "  [5] Start upload\n"
+    "  [6] Exit"
+)
+
+SELECT_MENU = (
+    f"\n{Colors.YELLOW}Commands:{Colors.END}\n"
+    "  [number] - Toggle file selection\n"
+    "  [a] - Select all files\n"
+    "  [n] - Select none\n"
+    "  [f] - Filter files by pattern\n"
+    "  [>] / [<] - Next / previous page\n"
+    "  [d] - Done with selection"
+)
+
+# Files listed per page in interactive selection
+SELECT_PAGE_SIZE = 20
+
+QUEUE_MENU = (
+    f"\n{Colors.YELLOW}Commands:{Colors.END}\n"
+    "  [1] View queue contents\n"
+    "  [2] Remove file from queue\n"
+    "  [3] Clear completed files\n"
+    "  [4] Clear failed files\n"
+    "  [5] Clear entire queue\n"
+    "  [6] Retry failed files\n"
+    "  [7] Back to main menu"
+)
+
+EMPTY_QUEUE_MENU = (
+    f"{Colors.YELLOW}Queue is empty{Colors.END}\n"
+    f"\n{Colors.YELLOW}Commands:{Colors.END}\n"
+    "  [1] Back to main menu"
+)
+
+SETTINGS_MENU = (
+    f"\n{Colors.YELLOW}Commands:{Colors.END}\n"
+    "  [1] Change URL\n"
+    "  [2] Change security key\n"
+    "  [3] Change max file size\n"
+    "  [4] Change concurrent uploads\n"
+    "  [5] Toggle compression\n"
+    "  [6] Toggle encryption\n"
+    "  [7] Back to main menu"
+)
+
+@functools.lru_cache(maxsize=1024)
+def _guess_mime(suffix: str) -> str:
+    """Guess a MIME type from a (lower-cased) file suffix"""
+    mime_type, _ = mimetypes.guess_type('x' + suffix)
+    return mime_type or 'application/octet-stream'
+
+def _mime_suffix(name: str) -> str:
+    """Last two suffixes of a file name, lower-cased (so e.g. ".tar.gz" still resolves)
+    
+    Same result as ''.join(Path(name).suffixes[-2:]).lower(), without the Path.
+    """
+    if name.endswith('.'):
+        return ''
+    parts = name.lstrip('.').split('.')[1:][-2:]
+    return ''.join('.' + part for part in parts).lower()
+
+def _auto_workers(configured: int, mean_size: float, cpu_count: Optional[int]) -> int:
+    """Number of concurrent uploads to use for a batch, at most ``configured``
+    
+    Small files are cheap to send but each upload in flight holds buffers and
+    a connection, so their concurrency is capped by CPU count; large files
+    are latency-bound and may use up to 16.
+    """
+    if mean_size < READ_BUFFER_SIZE:
+        return max(1, min(configured, max(4, (cpu_count or 1) * 2)))
+    return max(1, min(configured, 16))
+
+@dataclass(**DATACLASS_SLOTS)
 class UploadStats:
     """Statistics for upload operations"""
     total_files: int = 0
@@ -104,45 +238,138 @@ class UploadStats:
     skipped_files: int = 0
     total_bytes: int = 0
     uploaded_bytes: int = 0
-    start_time: float = 0
-    end_time: float = 0
-    
-    @property
-    def success_rate(self) -> float:
-        if self.total_files == 0:
-            return 0.0
-        return (self.uploaded_files / self.total_files) * 100
+    # time.monotonic_ns() readings: immune to wall-clock changes, integer arithmetic
+    start_time_ns: int = 0
+    end_time_ns: int = 0
+    # Derived figures, filled in by finalize()
+    success_rate: float = field(default=0.0, init=False)
+    duration: float = field(default=0.0, init=False)
+    upload_speed: float = field(default=0.0, init=False)
+    
+    def start(self):
+        """Start the clock"""
+        self.start_time_ns = time.monotonic_ns()
+    
+    def stop(self):
+        """Stop the clock"""
+        self.end_time_ns = time.monotonic_ns()
+    
+    def finalize(self):
+        """Stop the clock (unless already stopped) and compute the derived figures
+        
+        Call once the counters are final.
+        """
+        if self.end_time_ns <= 0:
+            self.stop()
+        self.duration = (self.end_time_ns - self.start_time_ns) / 1e9
+        if self.total_files > 0:
+            self.success_rate = (self.uploaded_files / self.total_files) * 100
+        else:
+            self.success_rate = 0.0
+        if self.duration > 0:
+            self.upload_speed = self.uploaded_bytes / self.duration
+        else:
+            self.upload_speed = 0.0
     
     @property
-    def duration(self) -> float:
-        if self.end_time > 0:
-            return self.end_time - self.start_time
-        return time.time() - self.start_time
+    def start_time(self) -> float:
+        """Start of the run in seconds, on the monotonic clock (not a wall-clock time)"""
+        return self.start_time_ns / 1e9
     
     @property
-    def upload_speed(self) -> float:
-        if self.duration > 0:
-            return self.uploaded_bytes / self.duration
-        return 0.0
+    def end_time(self) -> float:
+        """End of the run in seconds, on the monotonic clock; 0 while running"""
+        return self.end_time_ns / 1e9
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class FileInfo:
     """Information about a file to be uploaded"""
     path: Path
     size: int
     mtime: float
-    checksum: str
     mime_type: str
     relative_path: str
+    checksum: Optional[str] = None  # computed on demand, see UploadManager.ensure_checksum
     subdir: str = ''
     encrypted: bool = False
     compressed: bool = False
     chunk_count: int = 1
     resume_pos: int = 0
 
+@dataclass(frozen=True, **DATACLASS_SLOTS)
+class AESKey:
+    """An AES-256 key derived from the encryption passphrase, and its salt"""
+    key: bytes
+    salt: bytes
+    
+    @classmethod
+    def derive(cls, passphrase: str) -> 'AESKey':
+        """Derive a key with scrypt from a fresh random salt"""
+        salt = os.urandom(AES_SALT_SIZE)
+        key = hashlib.scrypt(passphrase.encode('utf-8'), salt=salt, n=2 ** 14, r=8, p=1, dklen=32)
+        return cls(key, salt)
+
+class CompressionAborted(Exception):
+    """Raised when streamed data turns out not to be worth compressing"""
+
+class BufferPool:
+    """Reusable read buffers, in a few power-of-two size classes
+    
+    Buffers are rented for the duration of one file (or one send) and given
+    back afterwards, instead of allocating a new bytearray each time. Each
+    class keeps at most ``per_class`` idle buffers; extra ones are dropped.
+    """
+    
+    SIZE_CLASSES = (4 << 10, MIN_CHUNK_SIZE, READ_BUFFER_SIZE)
+    
+    def __init__(self, per_class: int = 8):
+        self._idle = {size: LifoQueue(maxsize=per_class) for size in self.SIZE_CLASSES}
+    
+    def rent(self, size: int) -> bytearray:
+        """Get a buffer of the smallest class that holds ``size`` bytes (capped at the largest)"""
+        size_class = next((c for c in self.SIZE_CLASSES if c >= size), self.SIZE_CLASSES[-1])
+        try:
+            return self._idle[size_class].get_nowait()
+        except Empty:
+            return bytearray(size_class)
+    
+    def give_back(self, buffer: bytearray):
+        """Return a rented buffer; it must no longer be referenced"""
+        try:
+            self._idle[len(buffer)].put_nowait(buffer)
+        except Full:
+            pass
+
+# Per process; worker processes get their own
+BUFFER_POOL = BufferPool()
+
+def _send_from_file(f, sock: socket.socket, count: int = -1) -> int:
+    """Send up to ``count`` bytes of a file (all of it if -1) with a pooled buffer
+    
+    sendall() copies each chunk out before returning, so one buffer is reused
+    for the whole file. Returns the number of bytes sent.
+    """
+    buffer = BUFFER_POOL.rent(READ_BUFFER_SIZE if count < 0 else count)
+    view = memoryview(buffer)
+    sent = 0
+    try:
+        while count < 0 or sent < count:
+            n = f.readinto(view if count < 0 else view[:min(len(view), count - sent)])
+            if not n:
+                break
+            sock.sendall(view[:n])
+            sent += n
+    finally:
+        BUFFER_POOL.give_back(buffer)
+    return sent
+
 class Logger:
     """Simple logging utility"""
     
+    # Per-level name and console color, indexed by level
+    LEVEL_NAMES = ('DEBUG', 'INFO', 'WARNING', 'ERROR')
+    LEVEL_COLORS = (Colors.BLUE, Colors.GREEN, Colors.YELLOW, Colors.RED)
+    
     def __init__(self, level: str = 'INFO', log_file: Optional[str] = None):
         self.DEBUG = 0
         self.INFO = 1
@@ -150,30 +377,56 @@ class Logger:
         self.ERROR = 3
         self.level = getattr(self, level.upper(), self.INFO)
         self.log_file = log_file
+        self._tags = [f"] [{name}] " for name in self.LEVEL_NAMES]
+        self._timestamp_second = None
+        self._timestamp = ''
+        
+        # Keep the log file open for the whole run; it is flushed on
+        # WARNING and above, and closed at exit
+        self._fh = None
+        self._fh_lock = threading.Lock()
+        if log_file:
+            try:
+                self._fh = open(log_file, 'a', buffering=65536, encoding='utf-8')
+                atexit.register(self.close)
+            except Exception:
+                pass
+    
+    def close(self):
+        """Flush and close the log file"""
+        with self._fh_lock:
+            if self._fh is not None:
+                try:
+                    self._fh.close()
+                except Exception:
+                    pass
+                self._fh = None
         
+    def is_enabled_for(self, level: int) -> bool:
+        """Whether messages at ``level`` are logged, to skip work done only for them"""
+        return level >= self.level
+    
     def log(self, level: int, message: str, *args):
         if level >= self.level:
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            level_name = ['DEBUG', 'INFO', 'WARNING', 'ERROR'][level]
-            msg = f"[{timestamp}] [{level_name}] {message % args if args else message}"
+            # Timestamps only change once a second
+            now = int(time.time())
+            if now != self._timestamp_second:
+                self._timestamp_second = now
+                self._timestamp = datetime.fromtimestamp(now).strftime('%Y-%m-%d %H:%M:%S')
+            msg = f"[{self._timestamp}{self._tags[level]}{message % args if args else message}"
             
             # Print to console with colors
-            if level == self.DEBUG:
-                print(f"{Colors.BLUE}{msg}{Colors.END}")
-            elif level == self.INFO:
-                print(f"{Colors.GREEN}{msg}{Colors.END}")
-            elif level == self.WARNING:
-                print(f"{Colors.YELLOW}{msg}{Colors.END}")
-            elif level == self.ERROR:
-                print(f"{Colors.RED}{msg}{Colors.END}")
+            print(f"{self.LEVEL_COLORS[level]}{msg}{Colors.END}")
             
             # Write to log file if specified
-            if self.log_file:
-                try:
-                    with open(self.log_file, 'a', encoding='utf-8') as f:
-                        f.write(msg + '\n')
-                except Exception:
-                    pass
+            if self._fh is not None:
+                with self._fh_lock:
+                    try:
+                        self._fh.write(msg + '\n')
+                        if level >= self.WARNING:
+                            self._fh.flush()
+                    except Exception:
+                        pass
     
     def debug(self, message: str, *args):
         self.log(self.DEBUG, message, *args)
@@ -190,12 +443,17 @@ class Logger:
 class ProgressBar:
     """Simple progress bar for terminal output"""
     
+    # Minimum time between redraws; the final state is always drawn
+    RENDER_INTERVAL = 0.05  # seconds
+    
     def __init__(self, total: int, width: int = 50, desc: str = ''):
         self.total = total
         self.width = width
         self.desc = desc
         self.current = 0
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
+        self._last_render = 0.0
+        self._prefix = f"\r{desc} |"
         
     def update(self, n: int = 1):
         self.current = min(self.current + n, self.total)
@@ -208,12 +466,18 @@ class ProgressBar:
     def _display(self):
         if self.total == 0:
             return
+        
+        done = self.current >= self.total
+        now = time.monotonic()
+        if not done and now - self._last_render < self.RENDER_INTERVAL:
+            return
+        self._last_render = now
             
         progress = self.current / self.total
         filled = int(self.width * progress)
         bar = '█' * filled + '░' * (self.width - filled)
         
-        elapsed = time.time() - self.start_time
+        elapsed = now - self.start_time
         if progress > 0:
             eta = elapsed * (1 - progress) / progress
             eta_str = f"ETA: {int(eta//60):02d}:{int(eta%60):02d}"
@@ -221,12 +485,12 @@ class ProgressBar:
             eta_str = "ETA: --:--"
         
         speed = self.current / elapsed if elapsed > 0 else 0
-        speed_str = f"{speed:.1f}/s"
         
-        print(f"\r{self.desc} |{bar}| {self.current}/{self.total} ({progress*100:.1f}%) {speed_str} {eta_str}", end='', flush=True)
-        
-        if self.current >= self.total:
-            print()  # New line when complete
+        # One write (and flush) per redraw, with the newline when complete
+        end = '\n' if done else ''
+        sys.stdout.write(f"{self._prefix}{bar}| {self.current}/{self.total} ({progress*100:.1f}%) "
+                         f"{speed:.1f}/s {eta_str}{end}")
+        sys.stdout.flush()
 
 class ConfigManager:
     """Advanced configuration management with profiles"""
@@ -383,118 +647,178 @@ class FileValidator:
             self.include_patterns = include
         else:
             self.include_patterns = include.split(',') if include else []
+        
+        # Precompile patterns once, individually and as a single alternation regex
+        self._excludes = [(p, re.compile(self._translate(p))) for p in self.exclude_patterns]
+        self._exclude_re = self._compile_patterns(self.exclude_patterns)
+        self._include_re = self._compile_patterns(self.include_patterns)
     
-    def validate_file(self, file_path: Path, base_path: Path = None) -> Tuple[bool, str]:
-        """Validate a single file"""
+    @staticmethod
+    def _translate(pattern: str) -> str:
+        """Translate a shell-style pattern into a regex string"""
+        return fnmatch.translate(os.path.normcase(pattern.strip()))
+    
+    @staticmethod
+    def _compile_patterns(patterns: List[str]) -> Optional[re.Pattern]:
+        """Compile shell-style patterns into one regex, or None if there are none"""
+        if not patterns:
+            return None
+        return re.compile('|'.join(FileValidator._translate(p) for p in patterns))
+    
+    def validate_file(self, file_path: Path, base_path: Path = None,
+                      st: os.stat_result = None) -> Tuple[bool, str]:
+        """Validate a single file, optionally using an already-known stat result"""
         try:
-            # Check if file exists and is readable
-            if not file_path.exists():
-                return False, "File does not exist"
+            # Check if file exists and is a regular file
+            if st is None:
+                try:
+                    st = file_path.stat()
+                except FileNotFoundError:
+                    return False, "File does not exist"
             
-            if not file_path.is_file():
+            if not S_ISREG(st.st_mode):
                 return False, "Not a regular file"
             
-            if not os.access(file_path, os.R_OK):
-                return False, "File is not readable"
-            
-            # Check file size
-            file_size = file_path.stat().st_size
-            if file_size > self.max_size:
-                return False, f"File too large ({file_size} bytes, max {self.max_size})"
-            
-            # Check extension
-            ext = file_path.suffix.lower().lstrip('.')
-            if self.allowed_extensions and ext not in self.allowed_extensions:
-                return False, f"Extension '{ext}' not allowed"
-            
-            if ext in self.blocked_extensions:
-                return False, f"Extension '{ext}' is blocked"
-            
-            # Check patterns
             if base_path:
-                relative_path = file_path.relative_to(base_path)
-                path_str = str(relative_path)
+                path_str = str(file_path.relative_to(base_path))
             else:
                 path_str = str(file_path)
             
-            # Check exclude patterns
-            for pattern in self.exclude_patterns:
-                if fnmatch.fnmatch(path_str, pattern.strip()):
-                    return False, f"File matches exclude pattern: {pattern}"
-            
-            # Check include patterns (if specified)
-            if self.include_patterns:
-                matches_include = False
-                for pattern in self.include_patterns:
-                    if fnmatch.fnmatch(path_str, pattern.strip()):
-                        matches_include = True
-                        break
-                if not matches_include:
-                    return False, f"File does not match any include pattern"
-            
-            return True, "Valid"
+            return self._check(file_path.name, path_str, st)
             
         except Exception as e:
             return False, f"Validation error: {str(e)}"
     
+    def _check(self, name: str, path_str: str, st: os.stat_result) -> Tuple[bool, str]:
+        """Size, extension and pattern checks on plain strings
+        
+        ``path_str`` is the path matched against the include/exclude patterns.
+        """
+        # Check file size
+        file_size = st.st_size
+        if file_size > self.max_size:
+            return False, f"File too large ({file_size} bytes, max {self.max_size})"
+        
+        # Check extension
+        ext = os.path.splitext(name)[1][1:].lower()
+        if self.allowed_extensions and ext not in self.allowed_extensions:
+            return False, f"Extension '{ext}' not allowed"
+        
+        if ext in self.blocked_extensions:
+            return False, f"Extension '{ext}' is blocked"
+        
+        # Check patterns
+        path_str = os.path.normcase(path_str)
+        
+        # Check exclude patterns
+        if self._exclude_re is not None and self._exclude_re.match(path_str):
+            # Only a rejected file pays for finding the offending pattern
+            pattern = next((p for p, regex in self._excludes if regex.match(path_str)), '')
+            return False, f"File matches exclude pattern: {pattern}"
+        
+        # Check include patterns (if specified)
+        if self._include_re is not None and not self._include_re.match(path_str):
+            return False, f"File does not match any include pattern"
+        
+        return True, "Valid"
+    
     def scan_directory(self, dir_path: Path, max_depth: int = None) -> List[FileInfo]:
         """Scan directory and return list of valid files"""
+        return [self._create_file_info_from_entry(*item) for item in self._scan_entries(dir_path, max_depth)]
+    
+    def scan_sizes(self, dir_path: Path, max_depth: int = None) -> List[Tuple[str, int]]:
+        """Like scan_directory(), but only return (relative_path, size) of each valid file
+        
+        For listings such as --dry-run, which need no FileInfo (or MIME type).
+        """
+        return [(relative_path, st.st_size) for _, relative_path, st in self._scan_entries(dir_path, max_depth)]
+    
+    def _scan_entries(self, dir_path: Path,
+                      max_depth: int = None) -> List[Tuple[os.DirEntry, str, os.stat_result]]:
+        """Walk a directory, returning (entry, relative_path, stat) for each valid file"""
         if max_depth is None:
             max_depth = self.max_depth
         
-        files = []
-        base_path = dir_path
+        entries = []
+        # Entry paths all start with this; slicing it off gives the relative path
+        prefix_len = len(os.path.join(os.fspath(dir_path), ''))
         
-        def scan_recursive(current_path: Path, depth: int):
+        def scan_recursive(current_path: str, depth: int):
             if depth > max_depth:
                 return
             
             try:
-                for item in current_path.iterdir():
-                    if item.is_file():
-                        valid, reason = self.validate_file(item, base_path)
-                        if valid:
-                            file_info = self._create_file_info(item, base_path)
-                            files.append(file_info)
-                        # Skip invalid files silently in directory scan
-                    elif item.is_dir():
-                        scan_recursive(item, depth + 1)
+                with os.scandir(current_path) as it:
+                    for entry in it:
+                        if entry.is_file():
+                            relative_path = entry.path[prefix_len:]
+                            try:
+                                st = entry.stat()
+                                valid = S_ISREG(st.st_mode) and self._check(entry.name, relative_path, st)[0]
+                            except OSError:
+                                valid = False
+                            if valid:
+                                entries.append((entry, relative_path, st))
+                            # Skip invalid files silently in directory scan
+                        elif entry.is_dir():
+                            scan_recursive(entry.path, depth + 1)
             except PermissionError:
                 pass  # Skip directories we can't read
         
         scan_recursive(dir_path, 0)
-        return files
+        return entries
+    
+    @staticmethod
+    def _create_file_info_from_entry(entry: os.DirEntry, relative_path: str,
+                                     stat: os.stat_result) -> FileInfo:
+        """Create FileInfo object from a directory entry, reusing its cached stat"""
+        return FileInfo(
+            path=Path(entry.path),
+            size=stat.st_size,
+            mtime=stat.st_mtime,
+            mime_type=_guess_mime(_mime_suffix(entry.name)),
+            relative_path=relative_path
+        )
     
-    def _create_file_info(self, file_path: Path, base_path: Path) -> FileInfo:
+    def _create_file_info(self, file_path: Path, base_path: Path, stat: os.stat_result = None) -> FileInfo:
         """Create FileInfo object for a file"""
-        stat = file_path.stat()
+        if stat is None:
+            stat = file_path.stat()
         relative_path = str(file_path.relative_to(base_path))
         
-        # Calculate checksum
-        checksum = self._calculate_checksum(file_path)
-        
         # Detect MIME type
-        mime_type, _ = mimetypes.guess_type(str(file_path))
-        if not mime_type:
-            mime_type = 'application/octet-stream'
+        mime_type = _guess_mime(_mime_suffix(file_path.name))
         
         return FileInfo(
             path=file_path,
             size=stat.st_size,
             mtime=stat.st_mtime,
-            checksum=checksum,
             mime_type=mime_type,
             relative_path=relative_path
         )
     
-    def _calculate_checksum(self, file_path: Path) -> str:
-        """Calculate SHA-256 checksum of file"""
-        sha256_hash = hashlib.sha256()
+    @staticmethod
+    def _calculate_checksum(file_path: Path, algo: str = 'sha256') -> str:
+        """Calculate a file's checksum (hex digest) with the given hashlib algorithm"""
         try:
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(chunk)
-            return sha256_hash.hexdigest()
+            with open(file_path, "rb", buffering=0) as f:
+                # file_digest runs the read/update loop in C (Python 3.11+)
+                if sys.version_info >= (3, 11):
+                    return hashlib.file_digest(f, algo).hexdigest()
+
+                # Otherwise read into a pooled buffer instead of a new bytes per chunk
+                hasher = hashlib.new(algo)
+                buffer = BUFFER_POOL.rent(READ_BUFFER_SIZE)
+                view = memoryview(buffer)
+                try:
+                    while True:
+                        n = f.readinto(view)
+                        if not n:
+                            break
+                        hasher.update(view[:n])
+                finally:
+                    BUFFER_POOL.give_back(buffer)
+                return hasher.hexdigest()
         except Exception:
             return ""
 
@@ -505,40 +829,297 @@ class FileProcessor:
     def should_compress(file_info: FileInfo, threshold: int = 1024) -> bool:
         """Determine if file should be compressed"""
         # Don't compress already compressed files
-        compressed_extensions = {'.zip', '.gz', '.bz2', '.xz', '.7z', '.rar', 
-                               '.jpg', '.jpeg', '.png', '.gif', '.mp3', '.mp4', '.avi'}
-        
-        if file_info.path.suffix.lower() in compressed_extensions:
+        if file_info.path.suffix.lower() in COMPRESSED_EXTENSIONS:
             return False
         
         # Compress if file is larger than threshold
         return file_info.size > threshold
     
     @staticmethod
-    def compress_file(file_info: FileInfo, level: int = 6) -> bytes:
+    def iter_compressed(file_info: FileInfo, level: int = DEFAULT_CONFIG['compression_level'],
+                        max_ratio: float = None, hasher=None) -> Iterator[bytes]:
+        """Stream-compress file data to gzip format, yielding output as it is produced
+        
+        With ``max_ratio``, raises CompressionAborted as soon as the output
+        grows beyond that fraction of the input read so far. If ``hasher`` is
+        given it is fed the uncompressed data.
+        """
+        # wbits=31: gzip container; zlib writes a zero mtime, so output is reproducible
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        consumed = produced = 0
+        
+        def check():
+            if max_ratio is not None and produced > consumed * max_ratio:
+                raise CompressionAborted(f"{file_info.path} does not compress well")
+        
+        # zlib copies its input, so one pooled read buffer serves the whole file
+        pooled = BUFFER_POOL.rent(min(READ_BUFFER_SIZE, max(file_info.size, MIN_CHUNK_SIZE)))
+        buffer = memoryview(pooled)
+        try:
+            with open(file_info.path, 'rb', buffering=0) as f:
+                while True:
+                    n = f.readinto(buffer)
+                    if not n:
+                        break
+                    chunk = buffer[:n]
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    data = compressor.compress(chunk)
+                    consumed += n
+                    produced += len(data)
+                    check()
+                    if data:
+                        yield data
+        finally:
+            BUFFER_POOL.give_back(pooled)
+        
+        # Remaining buffered data and gzip trailer
+        data = compressor.flush()
+        produced += len(data)
+        check()
+        yield data
+    
+    @staticmethod
+    def compress_file(file_info: FileInfo, level: int = DEFAULT_CONFIG['compression_level']) -> bytes:
         """Compress file data"""
         try:
-            with open(file_info.path, 'rb') as f:
-                data = f.read()
-            
-            compressed = gzip.compress(data, compresslevel=level)
-            return compressed
+            return b"".join(FileProcessor.iter_compressed(file_info, level))
         except Exception:
             return b""
     
     @staticmethod
-    def encrypt_data(data: bytes, key: str) -> bytes:
-        """Simple encryption using XOR (for demonstration - use proper encryption in production)"""
+    def encrypt_data(data: bytes, key: str, offset: int = 0) -> bytes:
+        """Simple encryption using XOR (for demonstration - use proper encryption in production)
+        
+        ``offset`` is the position of ``data`` within the whole stream, so that
+        chunks can be encrypted independently.
+        """
         if not key:
             return data
         
         key_bytes = key.encode('utf-8')
-        encrypted = bytearray()
+        size = len(data)
+        if size == 0:
+            return b""
+        
+        # XOR the whole buffer in one C-level big-integer operation
+        start = offset % len(key_bytes)
+        key_stream = (key_bytes * (size // len(key_bytes) + 2))[start:start + size]
+        encrypted = int.from_bytes(data, 'little') ^ int.from_bytes(key_stream, 'little')
+        return encrypted.to_bytes(size, 'little')
+    
+    @staticmethod
+    def iter_encrypted(chunks: Iterable[bytes], key: str) -> Iterator[bytes]:
+        """Encrypt a stream of chunks"""
+        offset = 0
+        for chunk in chunks:
+            yield FileProcessor.encrypt_data(chunk, key, offset)
+            offset += len(chunk)
+    
+    @staticmethod
+    def iter_aes_gcm(chunks: Iterable[bytes], aes_key: AESKey) -> Iterator[bytes]:
+        """Encrypt a stream of chunks with AES-256-GCM
         
-        for i, byte in enumerate(data):
-            encrypted.append(byte ^ key_bytes[i % len(key_bytes)])
+        Yields the salt and a random nonce first and the authentication tag
+        last, so the output is 44 bytes longer than the input.
+        """
+        nonce = os.urandom(AES_NONCE_SIZE)
+        encryptor = Cipher(algorithms.AES(aes_key.key), modes.GCM(nonce)).encryptor()
+        yield aes_key.salt + nonce
+        for chunk in chunks:
+            yield encryptor.update(chunk)
+        yield encryptor.finalize() + encryptor.tag
+    
+    @staticmethod
+    def iter_hashed(chunks: Iterable[bytes], hasher) -> Iterator[bytes]:
+        """Pass chunks through unchanged, feeding each one to ``hasher``"""
+        for chunk in chunks:
+            hasher.update(chunk)
+            yield chunk
+    
+    @staticmethod
+    def iter_file(path: Path, size: int, offset: int = 0) -> Iterator[bytes]:
+        """Read exactly ``size`` bytes of a file, from ``offset``, in buffer-sized chunks"""
+        remaining = size
+        with open(path, 'rb', buffering=0) as f:
+            f.seek(offset)
+            while remaining > 0:
+                chunk = f.read(min(READ_BUFFER_SIZE, remaining))
+                if not chunk:
+                    raise ValueError(f"File changed during upload: {path}")
+                remaining -= len(chunk)
+                yield chunk
+
+    @staticmethod
+    def iter_file_into(path: Path, size: int, offset: int = 0) -> Iterator[memoryview]:
+        """Like iter_file(), but yields views of a single pooled buffer
         
-        return bytes(encrypted)
+        Each chunk is only valid until the next one is requested, so consumers
+        must copy or fully process it first (as zlib, hashlib and the ciphers do).
+        """
+        remaining = size
+        pooled = BUFFER_POOL.rent(min(READ_BUFFER_SIZE, max(size, 1)))
+        buffer = memoryview(pooled)
+        try:
+            with open(path, 'rb', buffering=0) as f:
+                f.seek(offset)
+                while remaining > 0:
+                    n = f.readinto(buffer[:min(len(buffer), remaining)])
+                    if not n:
+                        raise ValueError(f"File changed during upload: {path}")
+                    remaining -= n
+                    yield buffer[:n]
+        finally:
+            BUFFER_POOL.give_back(pooled)
+    
+    @staticmethod
+    def transform_into(out, file_info: FileInfo, size: int, compress: bool, level: int,
+                       key: Union[str, AESKey], checksum: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        """Compress and/or encrypt a file, streaming the result into a binary file object
+        
+        Returns (compressed, digest). The compressed output is only kept if it
+        saves enough space (see MAX_COMPRESSION_RATIO), and compression stops
+        early once it cannot. ``checksum`` names a hashlib algorithm: the digest
+        of the original file is computed from the same reads. Without it, None
+        is returned for the digest.
+        ``key`` is either an XOR passphrase or an AESKey.
+        """
+        def write(chunks: Iterable[bytes]):
+            if isinstance(key, AESKey):
+                chunks = FileProcessor.iter_aes_gcm(chunks, key)
+            elif key:
+                chunks = FileProcessor.iter_encrypted(chunks, key)
+            for chunk in chunks:
+                out.write(chunk)
+        
+        compressed = False
+        if compress:
+            hasher = hashlib.new(checksum) if checksum else None
+            try:
+                write(FileProcessor.iter_compressed(file_info, level, MAX_COMPRESSION_RATIO, hasher))
+                compressed = True
+            except CompressionAborted:
+                # Not worth it: send the original bytes instead
+                out.seek(0)
+                out.truncate()
+        
+        if not compressed:
+            hasher = hashlib.new(checksum) if checksum else None
+            chunks = FileProcessor.iter_file_into(file_info.path, size)
+            if hasher is not None:
+                chunks = FileProcessor.iter_hashed(chunks, hasher)
+            write(chunks)
+        
+        return compressed, hasher.hexdigest() if hasher else None
+    
+    @staticmethod
+    def transform_to_file(file_info: FileInfo, size: int, compress: bool, level: int,
+                          key: Union[str, AESKey],
+                          temp_dir: Optional[str] = None,
+                          checksum: Optional[str] = None) -> Tuple[str, int, bool, Optional[str]]:
+        """Compress and/or encrypt a file into a temporary file
+        
+        Runs on a worker process. Returns (temp_path, length, compressed,
+        digest); see transform_into().
+        """
+        fd, temp_path = tempfile.mkstemp(prefix='upload_', dir=temp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                compressed, digest = FileProcessor.transform_into(
+                    out, file_info, size, compress, level, key, checksum)
+                return temp_path, out.tell(), compressed, digest
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+class FileRegion:
+    """A byte range of a file used as part of a request body
+    
+    Iterating yields its chunks; _make_request instead sends it with
+    socket.sendfile(), which copies file pages to the socket in the kernel.
+    Where that is unavailable (TLS sockets, no os.sendfile) it is sent in
+    READ_BUFFER_SIZE writes rather than socket.sendfile's 8 KiB fallback.
+    """
+    
+    def __init__(self, path: Path, offset: int, count: int):
+        self.path = path
+        self.offset = offset
+        self.count = count
+    
+    def __iter__(self) -> Iterator[bytes]:
+        return FileProcessor.iter_file(self.path, self.count, self.offset)
+    
+    def open(self):
+        """Open the file for send_to()"""
+        return open(self.path, 'rb', buffering=0)
+    
+    def iter_from(self, f) -> Iterator[bytes]:
+        """Read the region from ``f``, as returned by open(), in buffer-sized chunks"""
+        f.seek(self.offset)
+        remaining = self.count
+        while remaining > 0:
+            chunk = f.read(min(READ_BUFFER_SIZE, remaining))
+            if not chunk:
+                raise ValueError(f"File changed during upload: {self.path}")
+            remaining -= len(chunk)
+            yield chunk
+    
+    def send_to(self, sock: socket.socket, f):
+        """Send the region over a socket, from ``f`` as returned by open()"""
+        # socket.sendfile() rejects a zero count; an empty region sends nothing
+        if self.count == 0:
+            return
+        if isinstance(sock, ssl.SSLSocket) or not hasattr(os, 'sendfile'):
+            f.seek(self.offset)
+            sent = _send_from_file(f, sock, self.count)
+        else:
+            sent = sock.sendfile(f, self.offset, self.count)
+        if sent < self.count:
+            raise ValueError(f"File changed during upload: {self.path}")
+
+class TempFileChunks:
+    """Iterate over a temporary file in chunks; close() deletes it"""
+    
+    def __init__(self, path: str):
+        self.path = path
+    
+    def __iter__(self) -> Iterator[bytes]:
+        with open(self.path, 'rb', buffering=0) as f:
+            yield from iter(lambda: f.read(READ_BUFFER_SIZE), b"")
+    
+    def send_to(self, sock: socket.socket):
+        """Send the whole file over a socket"""
+        with open(self.path, 'rb', buffering=0) as f:
+            _send_from_file(f, sock)
+    
+    def close(self):
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+class SpooledChunks:
+    """Iterate over a SpooledTemporaryFile from the start; close() discards it"""
+    
+    def __init__(self, spool: tempfile.SpooledTemporaryFile):
+        self.spool = spool
+    
+    def __iter__(self) -> Iterator[bytes]:
+        self.spool.seek(0)
+        yield from iter(lambda: self.spool.read(READ_BUFFER_SIZE), b"")
+    
+    def send_to(self, sock: socket.socket):
+        """Send the whole spool over a socket"""
+        # SpooledTemporaryFile only has readinto() from Python 3.11
+        if not hasattr(self.spool, 'readinto'):
+            for chunk in self:
+                sock.sendall(chunk)
+            return
+        self.spool.seek(0)
+        _send_from_file(self.spool, sock)
+    
+    def close(self):
+        self.spool.close()
 
 class ResumeManager:
     """Manages resume state for large file uploads"""
@@ -552,7 +1133,8 @@ class ResumeManager:
     
     def get_resume_file(self, file_info: FileInfo) -> Path:
         """Get resume state file path for a file"""
-        resume_hash = hashlib.md5(f"{file_info.path}:{file_info.size}:{file_info.mtime}".encode()).hexdigest()
+        resume_hash = hashlib.blake2b(f"{file_info.path}:{file_info.size}:{file_info.mtime}".encode(),
+                                      digest_size=16).hexdigest()
         return self.resume_dir / f"{resume_hash}.json"
     
     def save_resume_state(self, file_info: FileInfo, uploaded_bytes: int, chunk_size: int):
@@ -567,11 +1149,18 @@ class ResumeManager:
             'timestamp': time.time()
         }
         
+        # Write a temp file and rename it over the old state, so an interrupted
+        # write never leaves a torn state file behind
+        temp_file = resume_file.with_suffix('.tmp')
         try:
-            with open(resume_file, 'w') as f:
+            with open(temp_file, 'w') as f:
                 json.dump(state, f)
+            os.replace(temp_file, resume_file)
         except Exception:
-            pass
+            try:
+                temp_file.unlink()
+            except OSError:
+                pass
     
     def load_resume_state(self, file_info: FileInfo) -> Tuple[int, int]:
         """Load resume state and return (uploaded_bytes, chunk_size)"""
@@ -615,6 +1204,100 @@ class ResumeManager:
         except Exception:
             pass
 
+class ConnectionPool:
+    """Pool of persistent (keep-alive) HTTP connections to the upload server
+    
+    Honors the http_proxy/https_proxy/no_proxy environment, as urllib does:
+    HTTPS is tunnelled through the proxy with CONNECT, while plain HTTP
+    requests are sent to the proxy with an absolute URI (see request_target).
+    """
+    
+    def __init__(self, url: str, timeout: int = 30, maxsize: int = 4):
+        parsed = urllib.parse.urlsplit(url)
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.timeout = timeout
+        self._idle = LifoQueue(maxsize=max(1, maxsize))
+        self._ssl_context = ssl.create_default_context() if self.scheme == 'https' else None
+        
+        # Proxy (host, port) and its headers, if one applies to this URL
+        self.proxy = None
+        self.proxy_headers: Dict[str, str] = {}
+        proxy_url = urllib.request.getproxies().get(self.scheme)
+        if proxy_url and not urllib.request.proxy_bypass(parsed.netloc):
+            if '://' not in proxy_url:
+                proxy_url = 'http://' + proxy_url
+            proxy = urllib.parse.urlsplit(proxy_url)
+            self.proxy = (proxy.hostname, proxy.port or 80)
+            if proxy.username is not None:
+                credentials = f"{urllib.parse.unquote(proxy.username)}:{urllib.parse.unquote(proxy.password or '')}"
+                self.proxy_headers['Proxy-Authorization'] = (
+                    'Basic ' + base64.b64encode(credentials.encode('utf-8')).decode('ascii'))
+        
+        # Plain HTTP through a proxy addresses it with the absolute URI
+        self.absolute_uri = self.proxy is not None and self.scheme != 'https'
+    
+    def request_target(self, url: str, path: str) -> str:
+        """The request-target to send for ``url``, whose origin-form is ``path``"""
+        return url if self.absolute_uri else path
+    
+    def _new_connection(self) -> http.client.HTTPConnection:
+        """Open a new connection with Nagle's algorithm disabled"""
+        host, port = self.proxy or (self.host, self.port)
+        if self.scheme == 'https':
+            conn = http.client.HTTPSConnection(host, port, timeout=self.timeout,
+                                               context=self._ssl_context)
+            if self.proxy is not None:
+                conn.set_tunnel(self.host, self.port, headers=self.proxy_headers)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        conn.connect()
+        conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return conn
+    
+    @staticmethod
+    def _is_alive(conn: http.client.HTTPConnection) -> bool:
+        """Check that an idle connection has not been closed by the server"""
+        if conn.sock is None:
+            return False
+        try:
+            # An idle keep-alive socket only becomes readable on EOF
+            readable, _, _ = select.select([conn.sock], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        return not readable
+    
+    def get(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """Get an idle connection, or open a new one
+        
+        Returns the connection and whether it is a reused one.
+        """
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except Empty:
+                return self._new_connection(), False
+            
+            if self._is_alive(conn):
+                return conn, True
+            conn.close()
+    
+    def put(self, conn: http.client.HTTPConnection):
+        """Return a connection to the pool for reuse"""
+        try:
+            self._idle.put_nowait(conn)
+        except Full:
+            conn.close()
+    
+    def close(self):
+        """Close all idle connections"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except Empty:
+                break
+
 class UploadManager:
     """Manages file uploads with progress tracking and error handling"""
     
@@ -626,7 +1309,68 @@ class UploadManager:
         self.results = {}
         self.lock = threading.Lock()
         self.resume_manager = ResumeManager()
-        
+        self.connection_pool = ConnectionPool(
+            config['url'],
+            timeout=config.get('timeout', 30),
+            maxsize=int(config.get('max_concurrent', DEFAULT_CONFIG['max_concurrent']))
+        )
+        self._process_pool = None
+        
+        # Per-run request constants, so each request only adds its own headers
+        self._url = config['url']
+        parsed = urllib.parse.urlsplit(self._url)
+        self._path = self.connection_pool.request_target(
+            self._url, (parsed.path or '/') + ('?' + parsed.query if parsed.query else ''))
+        self._key = str(config['key'])
+        self._subdir = config.get('default_subdir', '') or ''  # for files without their own subdir
+        self._hash_algo = config.get('hash_algo', DEFAULT_CONFIG['hash_algo']) or DEFAULT_CONFIG['hash_algo']
+        self._user_agent = config.get('user_agent', f'{APP_NAME}/{VERSION}')
+        
+        # Encryption key: XOR uses the passphrase itself; the AES key is
+        # derived once per run, as scrypt is deliberately slow
+        self._encryption_key = ''
+        if config.get('encryption_enabled', False) and config.get('encryption_key'):
+            if config.get('encryption_method', 'xor') == 'aes-gcm':
+                self._encryption_key = AESKey.derive(config['encryption_key'])
+            else:
+                self._encryption_key = config['encryption_key']
+        
+        # Boundaries only need to be unique: a random per-run prefix plus a counter
+        self._boundary_prefix = f"----WebKitFormBoundary{secrets.token_hex(12)}"
+        self._boundary_counter = itertools.count()
+    
+    def _new_boundary(self) -> str:
+        """Return a multipart boundary not used before in this run"""
+        return f"{self._boundary_prefix}{next(self._boundary_counter):08x}"
+    
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Create the compression/encryption process pool on first use"""
+        with self.lock:
+            if self._process_pool is None:
+                # spawn: forking a process that is running upload threads is unsafe
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=os.cpu_count(),
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._process_pool
+    
+    def close(self):
+        """Release pooled connections and worker processes"""
+        self.connection_pool.close()
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+        
+    def _use_resumable(self, file_info: FileInfo) -> bool:
+        """Whether to upload in resumable chunks rather than as one request
+        
+        Chunks are sent straight from the file, so encrypted uploads always
+        take the single-request path, which encrypts the data.
+        """
+        if self._encryption_key or not self.config.get('resume_enabled', True):
+            return False
+        return file_info.size > self.config.get('resume_threshold', 10 * 1024 * 1024)  # 10MB
+    
     def upload_file(self, file_info: FileInfo, progress_callback: Callable = None) -> Dict[str, Any]:
         """Upload a single file with resume capability"""
         result = {
@@ -637,20 +1381,149 @@ class UploadManager:
         }
         
         try:
-            # Check if resume is enabled and file is large enough
-            resume_enabled = self.config.get('resume_enabled', True)
-            resume_threshold = self.config.get('resume_threshold', 10 * 1024 * 1024)  # 10MB
-            
-            if resume_enabled and file_info.size > resume_threshold:
-                return self._upload_file_resumable(file_info, progress_callback)
+            if self._use_resumable(file_info):
+                result = self._upload_file_resumable(file_info, progress_callback)
             else:
-                return self._upload_file_simple(file_info, progress_callback)
+                result = self._upload_file_simple(file_info, progress_callback)
+            
+            # The checksum is only reported in the debug log; don't re-read
+            # files to compute one nobody will see
+            if (result['success'] and self.logger.is_enabled_for(self.logger.DEBUG)
+                    and self.ensure_checksum(file_info)):
+                self.logger.debug("%s of %s: %s", self._hash_algo, file_info.relative_path, file_info.checksum)
+            return result
                 
         except Exception as e:
             result['error'] = str(e)
             self.logger.error("Upload error for %s: %s", file_info.relative_path, str(e))
             return result
     
+    def ensure_checksum(self, file_info: FileInfo) -> Optional[str]:
+        """Compute and cache a file's checksum, unless disabled by create_checksums"""
+        if file_info.checksum is None and self.config.get('create_checksums', True):
+            file_info.checksum = FileValidator._calculate_checksum(file_info.path, self._hash_algo)
+        return file_info.checksum
+    
+    def upload_files_async(self, files: List[FileInfo], result_callback: Callable = None):
+        """Upload files concurrently from one asyncio event loop (requires aiohttp)"""
+        asyncio.run(self._upload_files_async(files, result_callback))
+    
+    async def _upload_files_async(self, files: List[FileInfo], result_callback: Callable = None):
+        """Upload files over a shared aiohttp session, at most max_concurrent at a time"""
+        max_concurrent = int(self.config.get('max_concurrent', DEFAULT_CONFIG['max_concurrent']))
+        timeout = self.config.get('timeout', 30)
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        async def upload(file_info: FileInfo) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.upload_file_async(session, file_info)
+        
+        # Each running upload makes at most one blocking call at a time (a read,
+        # or a whole resumable upload), so one thread per slot never starves
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=max_concurrent))
+        
+        connector = aiohttp.TCPConnector(limit=max_concurrent, keepalive_timeout=30)
+        client_timeout = aiohttp.ClientTimeout(sock_connect=timeout, sock_read=timeout)
+        # trust_env: use the same http(s)_proxy/no_proxy settings as the http.client path
+        async with aiohttp.ClientSession(connector=connector, timeout=client_timeout,
+                                         trust_env=True) as session:
+            # Sliding window of tasks, as in the threaded path, rather than one per file up front
+            remaining = iter(files)
+            pending = {asyncio.ensure_future(upload(file_info))
+                       for file_info in itertools.islice(remaining, 2 * max_concurrent)}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if result_callback:
+                        result_callback(result)
+                for file_info in itertools.islice(remaining, len(done)):
+                    pending.add(asyncio.ensure_future(upload(file_info)))
+    
+    async def upload_file_async(self, session, file_info: FileInfo) -> Dict[str, Any]:
+        """Upload a single file over an aiohttp session"""
+        result = {
+            'success': False,
+            'error': None,
+            'response': None,
+            'file_info': file_info
+        }
+        loop = asyncio.get_running_loop()
+        
+        try:
+            # Resumable uploads keep the synchronous chunked path
+            if self._use_resumable(file_info):
+                return await loop.run_in_executor(None, self.upload_file, file_info)
+            
+            # Disk reads and compression run on the default executor
+            file_data, data_length = await loop.run_in_executor(None, self._prepare_file_data, file_info)
+            form_data, content_length, boundary = self._create_form_data(file_info, file_data, data_length)
+            
+            files = []
+            read_error = None
+            
+            async def body():
+                nonlocal read_error
+                chunks = self._iter_body(form_data)
+                while True:
+                    try:
+                        chunk = await loop.run_in_executor(None, next, chunks, None)
+                    except Exception as e:
+                        # aiohttp wraps this in a ClientError; keep it to report as itself
+                        read_error = e
+                        raise
+                    if chunk is None:
+                        break
+                    yield chunk
+            
+            headers = {
+                'Content-Type': 'multipart/form-data; boundary=' + boundary,
+                'Content-Length': str(content_length),
+                'User-Agent': self._user_agent
+            }
+            
+            try:
+                # Open the files to send before the request starts, as
+                # _make_request does: one that cannot be read then fails the
+                # upload here rather than part-way through the body
+                for i, part in enumerate(form_data):
+                    if isinstance(part, FileRegion):
+                        files.append(await loop.run_in_executor(None, part.open))
+                        form_data[i] = part.iter_from(files[-1])
+                
+                async with session.post(self._url, data=body(), headers=headers) as response:
+                    response_body = await response.read()
+                    status = response.status
+            except aiohttp.ClientError as e:
+                # A local read failure is not a network error
+                if read_error is not None:
+                    raise read_error
+                raise Exception(f"URL error: {str(e)}")
+            finally:
+                for f in files:
+                    f.close()
+                if hasattr(file_data, 'close'):
+                    file_data.close()
+            
+            if status >= 300:
+                raise Exception(f"HTTP {status}: {response_body.decode('utf-8', 'replace')}")
+            
+            result.update(self._parse_response(response_body, file_info))
+            
+            if result['success']:
+                self.logger.info("Uploaded: %s", file_info.relative_path)
+                if (self.logger.is_enabled_for(self.logger.DEBUG)
+                        and await loop.run_in_executor(None, self.ensure_checksum, file_info)):
+                    self.logger.debug("%s of %s: %s", self._hash_algo, file_info.relative_path, file_info.checksum)
+            else:
+                self.logger.error("Failed to upload %s: %s", file_info.relative_path, result['error'])
+        
+        except Exception as e:
+            result['error'] = str(e)
+            self.logger.error("Upload error for %s: %s", file_info.relative_path, str(e))
+        
+        return result
+    
     def _upload_file_simple(self, file_info: FileInfo, progress_callback: Callable = None) -> Dict[str, Any]:
         """Upload file in a single request"""
         result = {
@@ -661,13 +1534,17 @@ class UploadManager:
         }
         
         # Prepare file data
-        file_data = self._prepare_file_data(file_info)
+        file_data, data_length = self._prepare_file_data(file_info)
         
         # Create multipart form data
-        form_data, boundary = self._create_form_data(file_info, file_data)
+        form_data, content_length, boundary = self._create_form_data(file_info, file_data, data_length)
         
-        # Make request
-        response = self._make_request(form_data, boundary)
+        # Make request (the body is streamed from disk)
+        try:
+            response = self._make_request(form_data, boundary, content_length)
+        finally:
+            if hasattr(file_data, 'close'):
+                file_data.close()
         
         # Parse response
         result.update(self._parse_response(response, file_info))
@@ -700,45 +1577,64 @@ class UploadManager:
         
         # Upload in chunks
         total_uploaded = uploaded_bytes
-        chunk_size = self.config.get('chunk_size', 8192)
+        chunk_size = max(int(self.config.get('chunk_size', DEFAULT_CONFIG['chunk_size'])), MIN_CHUNK_SIZE)
+        
+        # One boundary for every chunk of this file
+        boundary = self._new_boundary()
+        
+        # Resume state is only written every RESUME_SAVE_INTERVAL/RESUME_SAVE_BYTES
+        saved_bytes = uploaded_bytes
+        last_save_time = time.monotonic()
+        
+        # Lets the kernel read the next chunk into the page cache while one is
+        # being sent; each chunk's FileRegion then reads it from there
+        readahead_fd = self._open_readahead(file_info.path)
         
         try:
-            with open(file_info.path, 'rb') as f:
-                # Seek to resume position
-                f.seek(uploaded_bytes)
+            while total_uploaded < file_info.size:
+                # Next chunk, starting at the resume position
+                chunk_length = min(chunk_size, file_info.size - total_uploaded)
+                chunk = FileRegion(file_info.path, total_uploaded, chunk_length)
                 
-                while total_uploaded < file_info.size:
-                    # Read chunk
-                    chunk = f.read(chunk_size)
-                    if not chunk:
-                        break
-                    
-                    # Create form data for chunk
-                    chunk_data, chunk_boundary = self._create_chunk_form_data(file_info, chunk, total_uploaded, file_info.size)
-                    
-                    # Make request
-                    response = self._make_request(chunk_data, chunk_boundary)
-                    
-                    # Parse response
-                    chunk_result = self._parse_response(response, file_info)
-                    
-                    if not chunk_result['success']:
-                        result['error'] = chunk_result['error']
-                        break
-                    
-                    # Update progress
-                    total_uploaded += len(chunk)
-                    
-                    # Save resume state
+                # Create form data for chunk
+                chunk_data, content_length, chunk_boundary = self._create_chunk_form_data(
+                    file_info, chunk, chunk_length, total_uploaded, file_info.size, boundary)
+                
+                if readahead_fd is not None:
+                    try:
+                        os.posix_fadvise(readahead_fd, total_uploaded + chunk_length, chunk_size,
+                                         os.POSIX_FADV_WILLNEED)
+                    except OSError:
+                        pass  # only a hint
+                
+                # Make request
+                response = self._make_request(chunk_data, chunk_boundary, content_length)
+                
+                # Parse response
+                chunk_result = self._parse_response(response, file_info)
+                
+                if not chunk_result['success']:
+                    result['error'] = chunk_result['error']
+                    break
+                
+                # Update progress
+                total_uploaded += chunk_length
+                
+                # Save resume state
+                now = time.monotonic()
+                if (total_uploaded - saved_bytes >= RESUME_SAVE_BYTES or
+                        now - last_save_time >= RESUME_SAVE_INTERVAL):
                     self.resume_manager.save_resume_state(file_info, total_uploaded, chunk_size)
-                    
-                    # Update progress callback
-                    if progress_callback:
-                        progress = total_uploaded / file_info.size
-                        progress_callback(progress)
-                    
-                    self.logger.debug("Uploaded chunk: %d/%d bytes (%.1f%%)", 
-                                    total_uploaded, file_info.size, (total_uploaded / file_info.size) * 100)
+                    saved_bytes = total_uploaded
+                    last_save_time = now
+                
+                # Update progress callback
+                if progress_callback:
+                    progress = total_uploaded / file_info.size
+                    progress_callback(progress)
+                
+                self.logger.debug("Uploaded chunk: %d/%d bytes (%.1f%%)", 
+                                total_uploaded, file_info.size, (total_uploaded / file_info.size) * 100)
             
             # Check if upload completed successfully
             if total_uploaded >= file_info.size:
@@ -757,167 +1653,267 @@ class UploadManager:
             result['error'] = str(e)
             self.logger.error("Resumable upload error for %s: %s", file_info.relative_path, str(e))
         
+        finally:
+            if readahead_fd is not None:
+                os.close(readahead_fd)
+            # Record progress not yet saved, so an interrupted upload resumes from here
+            if saved_bytes < total_uploaded < file_info.size:
+                self.resume_manager.save_resume_state(file_info, total_uploaded, chunk_size)
+        
         return result
     
-    def _create_chunk_form_data(self, file_info: FileInfo, chunk: bytes, offset: int, total_size: int) -> tuple[bytes, str]:
-        """Create form data for a chunk upload"""
-        boundary = f"----WebKitFormBoundary{secrets.token_hex(16)}"
-        
-        form_parts = []
-        
-        # Chunk data
-        form_parts.append(f'--{boundary}')
-        form_parts.append(f'Content-Disposition: form-data; name="chunk"')
-        form_parts.append('Content-Type: application/octet-stream')
-        form_parts.append('')
-        form_parts.append('')  # Placeholder for chunk data
-        
-        # File info
-        form_parts.append(f'--{boundary}')
-        form_parts.append(f'Content-Disposition: form-data; name="filename"')
-        form_parts.append('')
-        form_parts.append(file_info.path.name)
-        
-        form_parts.append(f'--{boundary}')
-        form_parts.append(f'Content-Disposition: form-data; name="offset"')
-        form_parts.append('')
-        form_parts.append(str(offset))
-        
-        form_parts.append(f'--{boundary}')
-        form_parts.append(f'Content-Disposition: form-data; name="total_size"')
-        form_parts.append('')
-        form_parts.append(str(total_size))
-        
-        # Security key
-        form_parts.append(f'--{boundary}')
-        form_parts.append(f'Content-Disposition: form-data; name="key"')
-        form_parts.append('')
-        form_parts.append(str(self.config['key']))
-        
-        # Subdirectory
-        if file_info.subdir:
-            form_parts.append(f'--{boundary}')
-            form_parts.append(f'Content-Disposition: form-data; name="subdir"')
-            form_parts.append('')
-            form_parts.append(file_info.subdir)
-        
-        # Close boundary
-        form_parts.append(f'--{boundary}--')
-        
-        # Build form data
-        form_data = b'\r\n'.join([part.encode('utf-8') for part in form_parts])
-        
-        # Insert chunk data
-        chunk_pos = form_data.find(b'\r\n\r\n\r\n')
-        if chunk_pos != -1:
-            form_data = form_data[:chunk_pos + 4] + chunk + form_data[chunk_pos + 4:]
-        
-        return form_data, boundary
-    
-    def _prepare_file_data(self, file_info: FileInfo) -> bytes:
-        """Prepare file data for upload (compression/encryption)"""
+    @staticmethod
+    def _open_readahead(path: Path) -> Optional[int]:
+        """Open a file descriptor for readahead hints, where posix_fadvise exists
+        
+        Callers request each upcoming range with POSIX_FADV_WILLNEED. That
+        populates the shared page cache, so it helps the separate descriptors
+        the chunks are read through; per-descriptor hints such as
+        POSIX_FADV_SEQUENTIAL would not, and are not used.
+        """
+        if not hasattr(os, 'posix_fadvise'):
+            return None
+        try:
+            return os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+    
+    def _create_chunk_form_data(self, file_info: FileInfo, chunk: Iterable[bytes], chunk_length: int,
+                                offset: int, total_size: int, boundary: str) -> Tuple[List[Any], int, str]:
+        """Create form data for a chunk upload
+        
+        Returns the body parts (see _make_request), its total length and the boundary.
+        """
+        head = self._build_form_header(boundary, 'chunk', 'application/octet-stream')
+        tail = self._build_form_trailer(boundary, file_info.subdir, [
+            ('filename', file_info.path.name),
+            ('offset', str(offset)),
+            ('total_size', str(total_size)),
+        ])
+        
+        return [head, chunk, tail], len(head) + chunk_length + len(tail), boundary
+    
+    def _prepare_file_data(self, file_info: FileInfo) -> Tuple[Iterable[bytes], int]:
+        """Prepare file data for upload (compression/encryption)
+        
+        Returns an iterable of body chunks and the total length in bytes.
+        """
         try:
-            with open(file_info.path, 'rb') as f:
-                data = f.read()
+            size = file_info.size
+            threshold = self.config.get('compress_threshold', 1024)
+            compress = FileProcessor.should_compress(file_info, threshold)
+            key = self._encryption_key
+            # AES-GCM changes the length, so it always goes through a transform
+            transform = compress or (key and (size >= threshold or isinstance(key, AESKey)))
+            
+            # Checksum the data as it is read for the upload, where possible
+            want_checksum = file_info.checksum is None and self.config.get('create_checksums', True)
+            checksum_algo = self._hash_algo if want_checksum else None
+            
+            # Small files are transformed here, into a buffer that stays in
+            # memory; the output is at most a few bytes larger than the input
+            if transform and size < SPOOL_MAX_SIZE:
+                spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE,
+                                                      dir=self.config.get('temp_dir') or None)
+                try:
+                    file_info.compressed, checksum = FileProcessor.transform_into(
+                        spool, file_info, size, compress,
+                        self.config.get('compression_level', DEFAULT_CONFIG['compression_level']),
+                        key, checksum_algo
+                    )
+                except BaseException:
+                    spool.close()
+                    raise
+                file_info.encrypted = bool(key)
+                if checksum:
+                    file_info.checksum = checksum
+                return SpooledChunks(spool), spool.tell()
+            
+            # Compression/encryption of larger files is CPU-bound: do it on a
+            # worker process, which hands back a temp file to stream
+            if transform:
+                future = self._get_process_pool().submit(
+                    FileProcessor.transform_to_file, file_info, size, compress,
+                    self.config.get('compression_level', DEFAULT_CONFIG['compression_level']), key,
+                    self.config.get('temp_dir') or None, checksum_algo
+                )
+                temp_path, size, file_info.compressed, checksum = future.result()
+                file_info.encrypted = bool(key)
+                if checksum:
+                    file_info.checksum = checksum
+                return TempFileChunks(temp_path), size
             
-            # Apply compression if needed
-            if FileProcessor.should_compress(file_info, self.config.get('compress_threshold', 1024)):
-                compressed = FileProcessor.compress_file(file_info, self.config.get('compression_level', 6))
-                if compressed and len(compressed) < len(data):
-                    file_info.compressed = True
-                    data = compressed
+            # Otherwise send the file as-is
+            data = FileRegion(file_info.path, 0, size)
             
             # Apply encryption if enabled
-            if self.config.get('encryption_enabled', False):
-                key = self.config.get('encryption_key', '')
-                if key:
-                    encrypted = FileProcessor.encrypt_data(data, key)
-                    file_info.encrypted = True
-                    data = encrypted
+            if key:
+                if want_checksum:
+                    data = self._iter_checksummed(file_info, data, self._hash_algo)
+                data = FileProcessor.iter_encrypted(data, key)
+                file_info.encrypted = True
             
-            return data
+            return data, size
             
         except Exception as e:
+            # Never fall back to an empty body: the upload must fail
             self.logger.error("Error preparing file data: %s", str(e))
-            return b""
+            raise
     
-    def _create_form_data(self, file_info: FileInfo, file_data: bytes) -> tuple[bytes, str]:
-        """Create multipart form data"""
-        boundary = f"----WebKitFormBoundary{secrets.token_hex(16)}"
+    @staticmethod
+    def _iter_checksummed(file_info: FileInfo, chunks: Iterable[bytes], algo: str) -> Iterator[bytes]:
+        """Pass file chunks through, setting file_info.checksum once all are read"""
+        hasher = hashlib.new(algo)
+        yield from FileProcessor.iter_hashed(chunks, hasher)
+        file_info.checksum = hasher.hexdigest()
+    
+    def _create_form_data(self, file_info: FileInfo, file_data: Iterable[bytes],
+                          data_length: int) -> Tuple[List[Any], int, str]:
+        """Create a streaming multipart form body
         
-        form_parts = []
+        Returns the body parts (see _make_request), its total length and the boundary.
+        """
+        boundary = self._new_boundary()
         
         # File field
         filename = file_info.path.name
         if file_info.compressed:
             filename += '.gz'
         
-        form_parts.append(f'--{boundary}')
-        form_parts.append(f'Content-Disposition: form-data; name="file"; filename="{filename}"')
-        form_parts.append(f'Content-Type: {file_info.mime_type}')
-        form_parts.append('')
-        form_parts.append('')  # Placeholder for file data
-        
-        # Security key
-        form_parts.append(f'--{boundary}')
-        form_parts.append(f'Content-Disposition: form-data; name="key"')
-        form_parts.append('')
-        form_parts.append(str(self.config['key']))
-        
-        # Subdirectory
-        if file_info.subdir:
-            form_parts.append(f'--{boundary}')
-            form_parts.append(f'Content-Disposition: form-data; name="subdir"')
-            form_parts.append('')
-            form_parts.append(file_info.subdir)
-        
-        # Close boundary
-        form_parts.append(f'--{boundary}--')
-        
-        # Build form data
-        form_data = b'\r\n'.join([part.encode('utf-8') for part in form_parts])
-        
-        # Insert file data
-        file_data_pos = form_data.find(b'\r\n\r\n\r\n')
-        if file_data_pos != -1:
-            form_data = form_data[:file_data_pos + 4] + file_data + form_data[file_data_pos + 4:]
-        
-        return form_data, boundary
-    
-    def _make_request(self, form_data: bytes, boundary: str) -> str:
-        """Make HTTP request"""
-        url = self.config['url']
-        timeout = self.config.get('timeout', 30)
+        header = self._build_form_header(boundary, 'file', file_info.mime_type, filename)
+        trailer = self._build_form_trailer(boundary, file_info.subdir)
+        
+        return [header, file_data, trailer], len(header) + data_length + len(trailer), boundary
+    
+    @staticmethod
+    def _build_form_header(boundary: str, name: str, content_type: str, filename: str = None) -> bytes:
+        """Encode the part headers that precede a form field's raw data"""
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        return (f'--{boundary}\r\n'
+                f'Content-Disposition: {disposition}\r\n'
+                f'Content-Type: {content_type}\r\n\r\n').encode('utf-8')
+    
+    def _build_form_trailer(self, boundary: str, subdir: str,
+                            fields: List[Tuple[str, str]] = ()) -> bytes:
+        """Encode what follows the raw data: ``fields``, the key, subdir and the closing boundary
+        
+        An empty ``subdir`` falls back to the run's default_subdir.
+        """
+        fields = list(fields)
+        fields.append(('key', self._key))
+        subdir = subdir or self._subdir
+        if subdir:
+            fields.append(('subdir', subdir))
+        
+        parts = [''] + [f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}'
+                        for name, value in fields]
+        parts.append(f'--{boundary}--')
+        return '\r\n'.join(parts).encode('utf-8')
+    
+    @staticmethod
+    def _iter_body(form_data: List[Any]) -> Iterator[bytes]:
+        """Flatten request body parts into a stream of bytes"""
+        for part in form_data:
+            if isinstance(part, bytes):
+                yield part
+            else:
+                yield from part
+    
+    def _make_request(self, form_data, boundary: str, content_length: int = None) -> bytes:
+        """Make HTTP request
+        
+        ``form_data`` is either bytes or a list of body parts, each of which is
+        bytes, a FileRegion (sent with sendfile) or an iterable of bytes. A
+        list needs an explicit ``content_length``. Returns the raw response body.
+        """
+        if isinstance(form_data, bytes):
+            content_length = len(form_data)
+            form_data = [form_data]
         
         # Debug logging
-        self.logger.debug("Making request to: %s", url)
-        self.logger.debug("Using key: %s", self.config.get('key', 'NOT SET'))
+        self.logger.debug("Making request to: %s", self._url)
+        self.logger.debug("Using key: %s", self._key or 'NOT SET')
+        
+        headers = {
+            'Content-Type': 'multipart/form-data; boundary=' + boundary,
+            'Content-Length': str(content_length),
+            'User-Agent': self._user_agent
+        }
+        if self.connection_pool.absolute_uri:
+            headers.update(self.connection_pool.proxy_headers)
+        
+        # A body made only of these can be sent again
+        replayable = all(isinstance(part, (bytes, FileRegion, TempFileChunks, SpooledChunks))
+                         for part in form_data)
+        
+        # Open the files to send before the request starts: one that cannot be
+        # read then fails the upload here, rather than part-way through the
+        # body, where it would look like (and be handled as) a network error
+        with contextlib.ExitStack() as stack:
+            parts = [(part, stack.enter_context(part.open()) if isinstance(part, FileRegion) else None)
+                     for part in form_data]
+            
+            # Make request over a pooled keep-alive connection
+            retried = False
+            while True:
+                try:
+                    conn, reused = self.connection_pool.get()
+                except (http.client.HTTPException, OSError) as e:
+                    raise Exception(f"URL error: {str(e)}")
+                
+                try:
+                    conn.putrequest('POST', self._path)
+                    for name, value in headers.items():
+                        conn.putheader(name, value)
+                    conn.endheaders()
+                    
+                    for part, f in parts:
+                        if isinstance(part, bytes):
+                            conn.send(part)
+                        elif isinstance(part, FileRegion):
+                            part.send_to(conn.sock, f)
+                        elif isinstance(part, (TempFileChunks, SpooledChunks)):
+                            part.send_to(conn.sock)
+                        else:
+                            for chunk in part:
+                                conn.send(chunk)
+                    
+                    response = conn.getresponse()
+                    status = response.status
+                    body = response.read()
+                    break
+                except (http.client.HTTPException, OSError) as e:
+                    conn.close()
+                    # Other idle connections have likely gone the same way
+                    self.connection_pool.close()
+                    # The server may drop an idle keep-alive connection just as it
+                    # is reused; retry once on a fresh connection
+                    if (reused and replayable and not retried and
+                            isinstance(e, (ConnectionResetError, BrokenPipeError))):
+                        retried = True
+                        self.logger.debug("Kept-alive connection was closed, retrying: %s", str(e))
+                        continue
+                    raise Exception(f"URL error: {str(e)}")
+                except Exception:
+                    conn.close()
+                    raise
         
-        # Parse URL
-        parsed = urllib.parse.urlparse(url)
+        if response.will_close:
+            conn.close()
+        else:
+            self.connection_pool.put(conn)
         
-        # Create request
-        req = urllib.request.Request(
-            url,
-            data=form_data,
-            headers={
-                'Content-Type': 'multipart/form-data; boundary=' + boundary,
-                'User-Agent': self.config.get('user_agent', f'{APP_NAME}/{VERSION}')
-            }
-        )
+        if status >= 300:
+            raise Exception(f"HTTP {status}: {body.decode('utf-8', 'replace')}")
+        return body
+    
+    def _parse_response(self, response: bytes, file_info: FileInfo) -> Dict[str, Any]:
+        """Parse server response
         
-        # Make request
-        try:
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                return response.read().decode('utf-8')
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode('utf-8')
-            raise Exception(f"HTTP {e.code}: {error_body}")
-        except urllib.error.URLError as e:
-            raise Exception(f"URL error: {str(e)}")
-    
-    def _parse_response(self, response: str, file_info: FileInfo) -> Dict[str, Any]:
-        """Parse server response"""
+        json.loads() takes the raw body; it is only decoded to text for errors.
+        """
         try:
             data = json.loads(response)
             return {
@@ -925,11 +1921,12 @@ class UploadManager:
                 'error': data.get('message', 'Unknown error') if not data.get('success', False) else None,
                 'response': data
             }
-        except json.JSONDecodeError:
+        except ValueError:  # JSONDecodeError, or a body that is not valid UTF-8
+            text = response.decode('utf-8', 'replace')
             return {
                 'success': False,
-                'error': f"Invalid JSON response: {response[:200]}",
-                'response': response
+                'error': f"Invalid JSON response: {text[:200]}",
+                'response': text
             }
 
 def main():
@@ -967,7 +1964,11 @@ Examples:
     parser.add_argument('--subdir', help='Target subdirectory on server')
     parser.add_argument('--upload-path', dest='subdir', help='Target subdirectory on server (alias for --subdir)')
     parser.add_argument('--parallel', type=int, default=4, help='Number of parallel uploads')
-    parser.add_argument('--chunk-size', type=int, default=8192, help='Chunk size for uploads')
+    parser.add_argument('--max-concurrent-auto', dest='max_concurrent_auto', action='store_true', default=True,
+                        help='Lower --parallel to suit the file sizes and CPU count (default)')
+    parser.add_argument('--no-max-concurrent-auto', dest='max_concurrent_auto', action='store_false',
+                        help='Use --parallel exactly as given')
+    parser.add_argument('--chunk-size', type=int, help='Chunk size for resumable uploads in bytes (default: 262144)')
     parser.add_argument('--timeout', type=int, default=30, help='Request timeout in seconds')
     parser.add_argument('--retry', type=int, default=3, help='Number of retry attempts')
     
@@ -975,7 +1976,9 @@ Examples:
     parser.add_argument('--compress', action='store_true', help='Enable file compression')
     parser.add_argument('--encrypt', action='store_true', help='Enable file encryption')
     parser.add_argument('--encryption-key', help='Encryption key (will prompt if not provided)')
-    parser.add_argument('--compression-level', type=int, default=6, help='Compression level (1-9)')
+    parser.add_argument('--encryption-method', choices=ENCRYPTION_METHODS,
+                        help='Encryption method (default: xor; aes-gcm requires the cryptography package)')
+    parser.add_argument('--compression-level', type=int, help='Compression level (1-9, default: 4)')
     
     # Filtering options
     parser.add_argument('--include', help='Include pattern (e.g., "*.txt,*.pdf")')
@@ -1029,6 +2032,8 @@ Examples:
             config['encryption_enabled'] = True
         if args.encryption_key:
             config['encryption_key'] = args.encryption_key
+        if args.encryption_method:
+            config['encryption_method'] = args.encryption_method
         if args.compression_level:
             config['compression_level'] = args.compression_level
         if args.max_size:
@@ -1055,6 +2060,22 @@ Examples:
             logger.error("Security key not configured")
             return 1
         
+        try:
+            # shake_* have no fixed digest size, so cannot produce a checksum
+            if hashlib.new(config.get('hash_algo') or DEFAULT_CONFIG['hash_algo']).digest_size == 0:
+                raise ValueError
+        except ValueError:
+            logger.error("Unsupported hash algorithm: %s", config.get('hash_algo'))
+            return 1
+        
+        if config.get('encryption_enabled') and config.get('encryption_method', 'xor') != 'xor':
+            if config['encryption_method'] not in ENCRYPTION_METHODS:
+                logger.error("Unknown encryption method: %s", config['encryption_method'])
+                return 1
+            if Cipher is None:
+                logger.error("AES-GCM encryption requires the 'cryptography' package")
+                return 1
+        
         # Interactive mode
         if args.interactive:
             return interactive_mode(config, logger)
@@ -1080,13 +2101,7 @@ def interactive_mode(config: Dict[str, Any], logger: Logger) -> int:
         
         while True:
             print(f"\n{Colors.BOLD}Current Directory: {Colors.END}{current_dir}")
-            print(f"{Colors.CYAN}Commands:{Colors.END}")
-            print("  [1] Browse files and directories")
-            print("  [2] Select files for upload")
-            print("  [3] Upload queue management")
-            print("  [4] Configuration settings")
-            print("  [5] Start upload")
-            print("  [6] Exit")
+            print(MAIN_MENU)
             
             try:
                 choice = input(f"\n{Colors.YELLOW}Enter your choice (1-6): {Colors.END}").strip()
@@ -1119,10 +2134,10 @@ def interactive_mode(config: Dict[str, Any], logger: Logger) -> int:
 def browse_directory(current_dir: Path) -> Path:
     """Interactive directory browser"""
     try:
-        # Get directory contents
-        items = []
-        for item in sorted(current_dir.iterdir(), key=lambda x: (x.is_file(), x.name.lower())):
-            items.append(item)
+        # Get directory contents; DirEntry caches the file type from the
+        # directory read, and its stat() result on first use
+        with os.scandir(current_dir) as it:
+            items = sorted(it, key=lambda x: (x.is_file(), x.name.lower()))
         
         if not items:
             print(f"{Colors.YELLOW}Directory is empty{Colors.END}")
@@ -1169,7 +2184,7 @@ def browse_directory(current_dir: Path) -> Path:
                 if 0 <= index < len(items):
                     selected_item = items[index]
                     if selected_item.is_dir():
-                        return selected_item
+                        return Path(selected_item.path)
                     else:
                         print(f"{Colors.YELLOW}Selected file: {selected_item.name}{Colors.END}")
                         return current_dir
@@ -1197,69 +2212,78 @@ def select_files(current_dir: Path, config: Dict[str, Any], logger: Logger) -> L
         print(f"{Colors.YELLOW}No valid files found in current directory{Colors.END}")
         return []
     
-    # Display files with selection
-    selected_files = []
+    # Display files with selection; the selected list is only built on exit
     selected_indices = set()
+    page = 0
+    pages = (len(all_files) + SELECT_PAGE_SIZE - 1) // SELECT_PAGE_SIZE
     
     while True:
-        print(f"\n{Colors.CYAN}Available files ({len(all_files)} total, {len(selected_files)} selected):{Colors.END}")
-        print(f"{Colors.BOLD}{'Sel':<4} {'Size':<12} {'Name'}{Colors.END}")
-        print("-" * 60)
-        
-        for i, file_info in enumerate(all_files, 1):
+        # Only the current page is listed, written to the terminal in one call
+        start = page * SELECT_PAGE_SIZE
+        end = min(start + SELECT_PAGE_SIZE, len(all_files))
+        lines = [
+            f"\n{Colors.CYAN}Available files ({len(all_files)} total, {len(selected_indices)} selected)"
+            f" - page {page + 1}/{pages}, files {start + 1}-{end}:{Colors.END}\n",
+            f"{Colors.BOLD}{'Sel':<4} {'Size':<12} {'Name'}{Colors.END}\n",
+            "-" * 60 + "\n",
+        ]
+        for i in range(start + 1, end + 1):
+            file_info = all_files[i - 1]
             selected = "✓" if i in selected_indices else " "
             size = f"{file_info.size:,} bytes"
-            print(f"{Colors.GREEN}{selected:<4}{Colors.END} {size:<12} {file_info.relative_path}")
-        
-        print(f"\n{Colors.YELLOW}Commands:{Colors.END}")
-        print("  [number] - Toggle file selection")
-        print("  [a] - Select all files")
-        print("  [n] - Select none")
-        print("  [f] - Filter files by pattern")
-        print("  [d] - Done with selection")
+            lines.append(f"{Colors.GREEN}{selected:<4}{Colors.END} {size:<12} {file_info.relative_path}\n")
+        lines.append(SELECT_MENU + "\n")
+        sys.stdout.write("".join(lines))
+        sys.stdout.flush()
         
         try:
             choice = input(f"\n{Colors.YELLOW}Enter command: {Colors.END}").strip().lower()
         except (KeyboardInterrupt, EOFError):
-            return selected_files
+            break
         
         if choice == 'd':
             break
         elif choice == 'a':
             selected_indices = set(range(1, len(all_files) + 1))
-            selected_files = all_files.copy()
         elif choice == 'n':
             selected_indices.clear()
-            selected_files.clear()
         elif choice == 'f':
             filter_files(all_files, selected_indices)
+        elif choice == '>':
+            page = min(page + 1, pages - 1)
+        elif choice == '<':
+            page = max(page - 1, 0)
         else:
             try:
                 index = int(choice)
                 if 1 <= index <= len(all_files):
                     if index in selected_indices:
                         selected_indices.remove(index)
-                        selected_files = [all_files[i-1] for i in selected_indices]
                     else:
                         selected_indices.add(index)
-                        selected_files = [all_files[i-1] for i in selected_indices]
                 else:
                     print(f"{Colors.RED}Invalid file number{Colors.END}")
             except ValueError:
                 print(f"{Colors.RED}Invalid command{Colors.END}")
     
-    return selected_files
+    return [all_files[i - 1] for i in sorted(selected_indices)]
 
 def filter_files(all_files: List[FileInfo], selected_indices: set):
     """Filter files by pattern"""
     try:
         pattern = input(f"{Colors.YELLOW}Enter filter pattern (e.g., *.txt): {Colors.END}").strip()
-        if not pattern:
+        patterns = [p for p in pattern.split(',') if p.strip()]
+        if not patterns:
             return
         
+        # Compile once (comma-separated patterns become one alternation),
+        # with the same case handling as fnmatch.fnmatch
+        matcher = FileValidator._compile_patterns(patterns).match
+        normcase = os.path.normcase
+        
         filtered_count = 0
         for i, file_info in enumerate(all_files, 1):
-            if fnmatch.fnmatch(file_info.relative_path, pattern):
+            if matcher(normcase(file_info.relative_path)):
                 selected_indices.add(i)
                 filtered_count += 1
         
@@ -1276,29 +2300,65 @@ class UploadQueue:
             queue_file = Path.home() / '.config' / 'file_uploader' / 'queue.json'
         
         self.queue_file = Path(queue_file)
-        self.queue_file.parent.mkdir(parents=True, exist_ok=True)
-        self.queue: List[Dict[str, Any]] = []
-        self.load_queue()
+        # Loaded on first access, so callers that never look at it pay nothing
+        self._queue: Optional[List[Dict[str, Any]]] = None
+        self._status_counts: Optional[Counter] = None  # items per status, kept up to date by the methods below
+        self._dirty = False
+    
+    @property
+    def queue(self) -> List[Dict[str, Any]]:
+        if self._queue is None:
+            self.load_queue()
+        return self._queue
+    
+    @queue.setter
+    def queue(self, items: List[Dict[str, Any]]):
+        self._queue = items
+    
+    @property
+    def status_counts(self) -> Counter:
+        if self._status_counts is None:
+            self.load_queue()
+        return self._status_counts
     
     def load_queue(self):
         """Load queue from file"""
         try:
-            if self.queue_file.exists():
-                with open(self.queue_file, 'r') as f:
-                    data = json.load(f)
-                    self.queue = data.get('queue', [])
+            self._queue = json.loads(self.queue_file.read_bytes()).get('queue', [])
         except Exception:
-            self.queue = []
+            self._queue = []
+        self._status_counts = Counter(item['status'] for item in self._queue)
     
     def save_queue(self):
-        """Save queue to file"""
+        """Save queue to file
+        
+        Compact JSON, written to a temp file and renamed over the old queue.
+        """
+        temp_file = self.queue_file.with_suffix('.tmp')
         try:
-            with open(self.queue_file, 'w') as f:
-                json.dump({'queue': self.queue, 'timestamp': time.time()}, f, indent=2)
+            self.queue_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_file, 'w') as f:
+                json.dump({'queue': self.queue, 'timestamp': time.time()}, f, separators=(',', ':'))
+            os.replace(temp_file, self.queue_file)
+            self._dirty = False
         except Exception:
-            pass
+            try:
+                temp_file.unlink()
+            except OSError:
+                pass
     
-    def add_file(self, file_info: FileInfo, config: Dict[str, Any]):
+    def _changed(self, save: bool):
+        """Record a change, saving now unless a batch of changes is in progress"""
+        self._dirty = True
+        if save:
+            self.save_queue()
+    
+    def flush(self):
+        """Save the queue if it has unsaved changes"""
+        if self._dirty:
+            self.save_queue()
+    
+    def add_file(self, file_info: FileInfo, config: Dict[str, Any], save: bool = True):
         """Add file to queue"""
         queue_item = {
             'file_path': str(file_info.path),
@@ -1313,31 +2373,60 @@ class UploadQueue:
             'last_error': None
         }
         self.queue.append(queue_item)
-        self.save_queue()
+        self.status_counts['pending'] += 1
+        self._changed(save)
     
-    def remove_file(self, index: int):
+    def remove_file(self, index: int, save: bool = True):
         """Remove file from queue"""
         if 0 <= index < len(self.queue):
-            self.queue.pop(index)
-            self.save_queue()
-    
-    def clear_queue(self):
+            self.status_counts[self.queue.pop(index)['status']] -= 1
+            self._changed(save)
+    
+    def remove_status(self, status: str, save: bool = True):
+        """Remove all files with the given status"""
+        if self.status_counts[status]:
+            self.queue = [item for item in self.queue if item['status'] != status]
+            del self.status_counts[status]
+            self._changed(save)
+    
+    def retry_failed(self, save: bool = True) -> int:
+        """Mark all failed files as pending again; returns how many there were"""
+        count = self.status_counts['failed']
+        if count:
+            for item in self.queue:
+                if item['status'] == 'failed':
+                    item['status'] = 'pending'
+                    item['last_error'] = None
+            del self.status_counts['failed']
+            self.status_counts['pending'] += count
+            self._changed(save)
+        return count
+    
+    def clear_queue(self, save: bool = True):
         """Clear entire queue"""
         self.queue.clear()
-        self.save_queue()
+        self.status_counts.clear()
+        self._changed(save)
     
     def get_pending_files(self) -> List[Dict[str, Any]]:
         """Get all pending files"""
+        if not self.status_counts['pending']:
+            return []
         return [item for item in self.queue if item['status'] == 'pending']
     
-    def update_status(self, index: int, status: str, error: str = None):
-        """Update file status"""
+    def update_status(self, index: int, status: str, error: str = None, save: bool = True):
+        """Update file status
+        
+        Pass ``save=False`` when updating many items, then call flush() once.
+        """
         if 0 <= index < len(self.queue):
+            self.status_counts[self.queue[index]['status']] -= 1
+            self.status_counts[status] += 1
             self.queue[index]['status'] = status
             if error:
                 self.queue[index]['last_error'] = error
             self.queue[index]['attempts'] += 1
-            self.save_queue()
+            self._changed(save)
 
 def manage_upload_queue():
     """Manage upload queue"""
@@ -1348,30 +2437,22 @@ def manage_upload_queue():
         print(f"Queue contains {len(queue.queue)} files")
         
         if queue.queue:
-            pending = len(queue.get_pending_files())
-            completed = len([f for f in queue.queue if f['status'] == 'completed'])
-            failed = len([f for f in queue.queue if f['status'] == 'failed'])
+            pending = queue.status_counts['pending']
+            completed = queue.status_counts['completed']
+            failed = queue.status_counts['failed']
             
             print(f"  Pending: {pending}")
             print(f"  Completed: {completed}")
             print(f"  Failed: {failed}")
             
-            print(f"\n{Colors.YELLOW}Commands:{Colors.END}")
-            print("  [1] View queue contents")
-            print("  [2] Remove file from queue")
-            print("  [3] Clear completed files")
-            print("  [4] Clear failed files")
-            print("  [5] Clear entire queue")
-            print("  [6] Retry failed files")
-            print("  [7] Back to main menu")
+            print(QUEUE_MENU)
         else:
-            print(f"{Colors.YELLOW}Queue is empty{Colors.END}")
-            print(f"\n{Colors.YELLOW}Commands:{Colors.END}")
-            print("  [1] Back to main menu")
+            print(EMPTY_QUEUE_MENU)
         
         try:
             choice = input(f"\n{Colors.YELLOW}Enter choice: {Colors.END}").strip()
         except (KeyboardInterrupt, EOFError):
+            queue.flush()
             return
         
         if choice == '1':
@@ -1382,12 +2463,10 @@ def manage_upload_queue():
         elif choice == '2' and queue.queue:
             remove_file_from_queue(queue)
         elif choice == '3' and queue.queue:
-            queue.queue = [f for f in queue.queue if f['status'] != 'completed']
-            queue.save_queue()
+            queue.remove_status('completed')
             print(f"{Colors.GREEN}Cleared completed files{Colors.END}")
         elif choice == '4' and queue.queue:
-            queue.queue = [f for f in queue.queue if f['status'] != 'failed']
-            queue.save_queue()
+            queue.remove_status('failed')
             print(f"{Colors.GREEN}Cleared failed files{Colors.END}")
         elif choice == '5' and queue.queue:
             try:
@@ -1442,18 +2521,11 @@ def remove_file_from_queue(queue: UploadQueue):
 
 def retry_failed_files(queue: UploadQueue):
     """Retry failed files"""
-    failed_files = [f for f in queue.queue if f['status'] == 'failed']
-    if not failed_files:
+    retry_count = queue.retry_failed()
+    if not retry_count:
         print(f"{Colors.YELLOW}No failed files to retry{Colors.END}")
         return
     
-    retry_count = 0
-    for item in failed_files:
-        item['status'] = 'pending'
-        item['last_error'] = None
-        retry_count += 1
-    
-    queue.save_queue()
     print(f"{Colors.GREEN}Marked {retry_count} failed files for retry{Colors.END}")
 
 def configure_settings(config: Dict[str, Any]) -> Dict[str, Any]:
@@ -1470,14 +2542,7 @@ def configure_settings(config: Dict[str, Any]) -> Dict[str, Any]:
         print(f"  Compression: {'Enabled' if config.get('compression_enabled') else 'Disabled'}")
         print(f"  Encryption: {'Enabled' if config.get('encryption_enabled') else 'Disabled'}")
         
-        print(f"\n{Colors.YELLOW}Commands:{Colors.END}")
-        print("  [1] Change URL")
-        print("  [2] Change security key")
-        print("  [3] Change max file size")
-        print("  [4] Change concurrent uploads")
-        print("  [5] Toggle compression")
-        print("  [6] Toggle encryption")
-        print("  [7] Back to main menu")
+        print(SETTINGS_MENU)
         
         try:
             choice = input(f"\n{Colors.YELLOW}Enter choice (1-7): {Colors.END}").strip()
@@ -1540,28 +2605,40 @@ def command_line_mode(args: argparse.Namespace, config: Dict[str, Any], logger:
                 return 1
             
             validator = FileValidator(config)
-            files_to_upload = validator.scan_directory(dir_path)
+            # A dry run only lists names and sizes, so it skips building FileInfos
+            scan = validator.scan_sizes if args.dry_run else validator.scan_directory
+            files_to_upload = scan(dir_path)
             
         elif args.files:
             # Upload specified files
+            validator = FileValidator(config)
+            scan = validator.scan_sizes if args.dry_run else validator.scan_directory
+            seen = set()  # (device, inode) of each argument, so duplicates are only added once
             for file_path in args.files:
                 path = Path(file_path)
-                if not path.exists():
+                try:
+                    st = path.stat()
+                except OSError:
                     logger.error("File not found: %s", file_path)
                     return 1
                 
-                if path.is_file():
-                    validator = FileValidator(config)
-                    valid, reason = validator.validate_file(path)
-                    if valid:
-                        file_info = validator._create_file_info(path, path.parent)
-                        files_to_upload.append(file_info)
-                    else:
+                # stat() follows symlinks, so a link and its target count as one
+                if (st.st_dev, st.st_ino) in seen:
+                    logger.debug("Skipping duplicate argument: %s", file_path)
+                    continue
+                seen.add((st.st_dev, st.st_ino))
+                
+                # One stat result serves validation and FileInfo creation
+                if S_ISREG(st.st_mode):
+                    valid, reason = validator.validate_file(path, st=st)
+                    if not valid:
                         logger.warning("Skipping %s: %s", file_path, reason)
-                elif path.is_dir():
-                    validator = FileValidator(config)
-                    dir_files = validator.scan_directory(path)
-                    files_to_upload.extend(dir_files)
+                    elif args.dry_run:
+                        files_to_upload.append((path.name, st.st_size))
+                    else:
+                        files_to_upload.append(validator._create_file_info(path, path.parent, st))
+                elif S_ISDIR(st.st_mode):
+                    files_to_upload.extend(scan(path))
         
         else:
             logger.error("No files specified. Use -h for help.")
@@ -1571,24 +2648,30 @@ def command_line_mode(args: argparse.Namespace, config: Dict[str, Any], logger:
             logger.warning("No valid files found to upload")
             return 1
         
-        # Dry run
+        # Dry run: files_to_upload holds (relative_path, size) pairs
         if args.dry_run:
-            print(f"\n{Colors.YELLOW}Dry run - would upload {len(files_to_upload)} files:{Colors.END}")
-            for file_info in files_to_upload:
-                print(f"  {file_info.relative_path} ({file_info.size} bytes)")
+            lines = [f"\n{Colors.YELLOW}Dry run - would upload {len(files_to_upload)} files:{Colors.END}\n"]
+            lines.extend(f"  {relative_path} ({size} bytes)\n" for relative_path, size in files_to_upload)
+            sys.stdout.write("".join(lines))
             return 0
         
-        # Upload files
-        logger.info("Starting upload of %d files", len(files_to_upload))
+        # Upload files; one pass over the sizes serves the stats and auto-tuning
+        total_bytes = sum(file_info.size for file_info in files_to_upload)
+        if args.max_concurrent_auto:
+            mean_size = total_bytes / len(files_to_upload)
+            config['max_concurrent'] = _auto_workers(int(config['max_concurrent']), mean_size, os.cpu_count())
+        logger.info("Starting upload of %d files (%d at a time)", len(files_to_upload),
+                    min(len(files_to_upload), config['max_concurrent']))
+        
+        # Target subdirectory for all files: the UploadManager applies it to
+        # every file without one of its own, so the files are not touched
+        if args.subdir:
+            config['default_subdir'] = args.subdir
         
         upload_manager = UploadManager(config, logger)
         upload_manager.stats.total_files = len(files_to_upload)
-        upload_manager.stats.start_time = time.time()
-        
-        # Set subdirectory for all files
-        subdir = args.subdir or config.get('default_subdir', '')
-        for file_info in files_to_upload:
-            file_info.subdir = subdir
+        upload_manager.stats.total_bytes = total_bytes
+        upload_manager.stats.start()
         
         # Create progress bar
         progress = None
@@ -1597,42 +2680,64 @@ def command_line_mode(args: argparse.Namespace, config: Dict[str, Any], logger:
         
         # Upload files
         success_count = 0
-        with ThreadPoolExecutor(max_workers=config['max_concurrent']) as executor:
-            futures = []
-            
-            for file_info in files_to_upload:
-                future = executor.submit(upload_manager.upload_file, file_info)
-                futures.append(future)
+        
+        def handle_result(result: Dict[str, Any]):
+            nonlocal success_count
+            if result['success']:
+                success_count += 1
+                upload_manager.stats.uploaded_bytes += result['file_info'].size
             
-            for future in as_completed(futures):
-                try:
-                    result = future.result()
-                    if result['success']:
-                        success_count += 1
-                        upload_manager.stats.uploaded_bytes += result['file_info'].size
+            if progress:
+                progress.update(1)
+        
+        # Connections and worker processes are released even if interrupted
+        try:
+            if aiohttp is not None:
+                # Drive all uploads from a single event loop
+                upload_manager.upload_files_async(files_to_upload, handle_result)
+            elif len(files_to_upload) == 1:
+                # Nothing to overlap: upload on this thread instead of a pool
+                handle_result(upload_manager.upload_file(files_to_upload[0]))
+            else:
+                workers = config['max_concurrent']
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    # Sliding window: keep about two uploads per worker submitted,
+                    # rather than a future for every file at once
+                    remaining = iter(files_to_upload)
+                    pending = {executor.submit(upload_manager.upload_file, file_info)
+                               for file_info in itertools.islice(remaining, 2 * workers)}
                     
-                    if progress:
-                        progress.update(1)
-                        
-                except Exception as e:
-                    logger.error("Upload failed: %s", str(e))
-                    if progress:
-                        progress.update(1)
-        
-        upload_manager.stats.end_time = time.time()
-        upload_manager.stats.uploaded_files = success_count
-        upload_manager.stats.failed_files = len(files_to_upload) - success_count
+                    while pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            try:
+                                handle_result(future.result())
+                            except Exception as e:
+                                logger.error("Upload failed: %s", str(e))
+                                if progress:
+                                    progress.update(1)
+                        for file_info in itertools.islice(remaining, len(done)):
+                            pending.add(executor.submit(upload_manager.upload_file, file_info))
+        
+        finally:
+            upload_manager.close()
+        
+        stats = upload_manager.stats
+        stats.stop()
+        stats.uploaded_files = success_count
+        stats.failed_files = len(files_to_upload) - success_count
+        stats.finalize()
         
         # Print summary
         if not args.quiet:
             print(f"\n{Colors.BOLD}Upload Summary:{Colors.END}")
-            print(f"  Files uploaded: {Colors.GREEN}{upload_manager.stats.uploaded_files}{Colors.END}")
-            print(f"  Files failed: {Colors.RED}{upload_manager.stats.failed_files}{Colors.END}")
-            print(f"  Success rate: {upload_manager.stats.success_rate:.1f}%")
-            print(f"  Total time: {upload_manager.stats.duration:.1f}s")
-            print(f"  Upload speed: {upload_manager.stats.upload_speed / 1024:.1f} KB/s")
+            print(f"  Files uploaded: {Colors.GREEN}{stats.uploaded_files}{Colors.END}")
+            print(f"  Files failed: {Colors.RED}{stats.failed_files}{Colors.END}")
+            print(f"  Success rate: {stats.success_rate:.1f}%")
+            print(f"  Total time: {stats.duration:.1f}s")
+            print(f"  Upload speed: {stats.upload_speed / 1024:.1f} KB/s")
         
-        return 0 if upload_manager.stats.failed_files == 0 else 1
+        return 0 if stats.failed_files == 0 else 1
         
     except Exception as e:
         logger.error("Command line mode error: %s", str(e))
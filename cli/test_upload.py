@@ -5,44 +5,59 @@ Creates test files and demonstrates various features
 """
 
 import os
+import sys
+import json
 import tempfile
 import shutil
+import threading
+import unittest
+from http.server import HTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
 
+# Test file contents, built once as bytes so files are written without re-encoding
+TEST_FILES = [
+    ("small.txt", b"This is a small text file for testing."),
+    ("medium.txt", b"This is a medium text file.\n" * 100),
+    ("large.txt", b"This is a large text file.\n" * 1000),
+    ("config.json", b'{"test": true, "value": 123}'),
+    ("data.csv", b"name,age,city\nAlice,25,NYC\nBob,30,LA\n"),
+    ("image.jpg", b"fake image data" * 100),  # Binary data
+    ("empty.txt", b""),  # Zero-byte file
+]
+
+NESTED_FILES = [
+    ("nested.txt", b"This is a nested file."),
+    ("another.json", b'{"nested": true}'),
+]
+
+def write_file(path: Path, data: bytes):
+    """Write a file with a single open and write"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
 def create_test_files():
     """Create test files for demonstration"""
     test_dir = Path("test_files")
     test_dir.mkdir(exist_ok=True)
     
     # Create various test files
-    test_files = [
-        ("small.txt", "This is a small text file for testing."),
-        ("medium.txt", "This is a medium text file.\n" * 100),
-        ("large.txt", "This is a large text file.\n" * 1000),
-        ("config.json", '{"test": true, "value": 123}'),
-        ("data.csv", "name,age,city\nAlice,25,NYC\nBob,30,LA\n"),
-        ("image.jpg", b"fake image data" * 100),  # Binary data
-    ]
-    
-    for filename, content in test_files:
+    for filename, content in TEST_FILES:
         file_path = test_dir / filename
-        
-        if isinstance(content, str):
-            file_path.write_text(content)
-        else:
-            file_path.write_bytes(content)
-        
+        write_file(file_path, content)
         print(f"Created: {file_path}")
     
     # Create subdirectories with files
     subdir = test_dir / "subdir"
     subdir.mkdir(exist_ok=True)
     
-    (subdir / "nested.txt").write_text("This is a nested file.")
-    (subdir / "another.json").write_text('{"nested": true}')
-    
-    print(f"Created: {subdir}/nested.txt")
-    print(f"Created: {subdir}/another.json")
+    for filename, content in NESTED_FILES:
+        write_file(subdir / filename, content)
+        print(f"Created: {subdir}/{filename}")
     
     return test_dir
 
@@ -53,6 +68,66 @@ def cleanup_test_files():
         shutil.rmtree(test_dir)
         print("Cleaned up test files")
 
+class RecordingHandler(BaseHTTPRequestHandler):
+    """Accept every upload and record the size of each request body"""
+    
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.body_sizes.append(len(body))
+        response = json.dumps({'success': True}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+    
+    def log_message(self, format, *args):
+        pass
+
+def test_unreadable_file_fails_upload():
+    """An unreadable file is a failed upload, not an empty one"""
+    sys.path.insert(0, str(Path(__file__).parent))
+    import file_uploader
+    from file_uploader import UploadManager, FileValidator, Logger, DEFAULT_CONFIG
+    
+    server = HTTPServer(('127.0.0.1', 0), RecordingHandler)
+    server.body_sizes = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        # secret.txt is compressed before sending; pic.jpg goes out with sendfile
+        for name in ("secret.txt", "pic.jpg"):
+            write_file(temp_dir / name, b"not for you\n" * 200)
+            os.chmod(temp_dir / name, 0)
+        if os.access(temp_dir / "secret.txt", os.R_OK):
+            raise unittest.SkipTest("file permissions are not enforced for this user")
+        
+        config = dict(DEFAULT_CONFIG, url=f"http://127.0.0.1:{server.server_port}/upload.php",
+                      key='test_key', resume_enabled=False)
+        files = FileValidator(config).scan_directory(temp_dir)
+        manager = UploadManager(config, Logger('ERROR'))
+        try:
+            results = [manager.upload_file(file_info) for file_info in files]
+            # The transport command_line_mode uses when aiohttp is installed
+            if file_uploader.aiohttp is not None:
+                manager.upload_files_async(files, results.append)
+        finally:
+            manager.close()
+        
+        assert len(results) == (4 if file_uploader.aiohttp is not None else 2)
+        for result in results:
+            assert not result['success'], result['file_info'].relative_path
+            assert 'Permission denied' in result['error'], result['error']
+            assert not result['error'].startswith('URL error'), result['error']
+        
+        # Nothing reached the server, not even a truncated request
+        assert server.body_sizes == []
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(temp_dir)
+
 def main():
     """Main test function"""
     print("Advanced File Uploader CLI - Test Setup")